@@ -1,3 +1,116 @@
+import functools
+import re
+import string
+from operator import add
+from typing import Iterable, Iterator
+
+# Message normalization in a single pass: uppercases ASCII letters and deletes every
+# character str.split() treats as whitespace (the highest of them is U+3000)
+_NORMALIZE = str.maketrans(string.ascii_lowercase, string.ascii_uppercase,
+                           ''.join(c for c in map(chr, range(0x3001)) if c.isspace()))
+
+# Translation tables rotating a letter index forward by 0-25 positions (_ROTATIONS[-n]
+# rotates back by n), padded to the 256 entries bytes.translate expects
+_ROTATIONS = [bytes((index + shift) % 26 for index in range(26)).ljust(256, b'\0') for shift in range(26)]
+
+# All letter indexes in order (A=0, ..., Z=25), the input the batched stages are applied to
+_INDEXES = bytes(range(26))
+
+# Bytes processed by the machine; everything else passes through unchanged
+_LETTERS = string.ascii_uppercase.encode('ascii')
+_NON_LETTERS = bytes(b for b in range(256) if b not in _LETTERS)
+_INDEX_TO_LETTER = _LETTERS.ljust(256, b'\0')
+
+# Index of every Latin-1 character as a setting letter: A-Z and a-z map to 0-25, anything else to 255
+_LETTER_INDEXES = bytes(ord(c.upper()) - 65 if c in string.ascii_letters else 255 for c in map(chr, range(256)))
+_PASSTHROUGH = re.compile(rb'([^A-Z]+)')
+
+
+def _pairs_table(pairs: tuple) -> bytes:
+    """
+    Builds a translation table swapping the letters of each pair.
+
+    :param pairs: Two-letter strings naming the connected letters
+    :return: Table mapping each letter index to its pair (or to itself if unconnected),
+             padded to the 256 entries bytes.translate expects
+    """
+    table = list(range(26))
+    for a, b in pairs:
+        table[ord(a) - 65], table[ord(b) - 65] = ord(b) - 65, ord(a) - 65
+    return bytes(table).ljust(256, b'\0')
+
+
+# Plugboard connections (Steckerbrett) - fixed pair substitutions shared by every machine
+_PLUGBOARD_TBL = _pairs_table(('AG', 'BK', 'CM', 'DZ', 'EL', 'FT', 'HV', 'IP', 'JX', 'NQ'))
+
+# Reflector UKW-B wiring
+_REFLECTOR_TBL = _pairs_table(('AR', 'BQ', 'CP', 'DO', 'EN', 'FM', 'GL', 'HK', 'IJ', 'SZ', 'TY', 'UX', 'VW'))
+
+
+def _wiring_table(wiring: dict) -> bytes:
+    """
+    Converts a letter-to-letter wiring into an index lookup table.
+
+    :param wiring: Dictionary mapping every letter A-Z to its wired letter
+    :return: Table where position i holds the index of the letter wired to i,
+             padded to the 256 entries bytes.translate expects
+    """
+    return bytes(ord(wiring[chr(i + 65)]) - 65 for i in range(26)).ljust(256, b'\0')
+
+
+def _inverse_table(table: bytes) -> bytes:
+    """
+    Builds the inverse of an index lookup table (used for the reverse rotor pass).
+
+    :param table: Table permuting the indexes 0-25
+    :return: Table where position table[i] holds i, padded like the input
+    """
+    inverse = bytearray(256)
+    for i in range(26):
+        inverse[table[i]] = i
+    return bytes(inverse)
+
+
+# Rotor I wiring (ETW - Eintrittswalze)
+_P_R1 = {
+    'A': 'E', 'B': 'K', 'C': 'M', 'D': 'F', 'E': 'L', 'F': 'G',
+    'G': 'D', 'H': 'Q', 'I': 'V', 'J': 'Z', 'K': 'N', 'L': 'T',
+    'M': 'O', 'N': 'W', 'O': 'Y', 'P': 'H', 'Q': 'X', 'R': 'U',
+    'S': 'S', 'T': 'P', 'U': 'A', 'V': 'I', 'W': 'B', 'X': 'R',
+    'Y': 'C', 'Z': 'J'
+}
+
+# Rotor II wiring
+_P_R2 = {
+    'A': 'K', 'B': 'T', 'C': 'S', 'D': 'B', 'E': 'P', 'F': 'O',
+    'G': 'G', 'H': 'U', 'I': 'L', 'J': 'R', 'K': 'H', 'L': 'E',
+    'M': 'F', 'N': 'M', 'O': 'D', 'P': 'W', 'Q': 'V', 'R': 'A',
+    'S': 'N', 'T': 'Q', 'U': 'I', 'V': 'X', 'W': 'J', 'X': 'Y',
+    'Y': 'C', 'Z': 'Z'
+}
+
+# Rotor III wiring
+_P_R3 = {
+    'A': 'S', 'B': 'B', 'C': 'W', 'D': 'P', 'E': 'U', 'F': 'D',
+    'G': 'H', 'H': 'T', 'I': 'G', 'J': 'F', 'K': 'C', 'L': 'N',
+    'M': 'E', 'N': 'Y', 'O': 'A', 'P': 'R', 'Q': 'O', 'R': 'I',
+    'S': 'L', 'T': 'X', 'U': 'K', 'V': 'J', 'W': 'Z', 'X': 'M',
+    'Y': 'Q', 'Z': 'V'
+}
+
+# Byte tables precomputed from the rotor wirings, one per rotor and direction. Each maps
+# an input index (A=0, ..., Z=25) straight to an output index, so the encryption path
+# never hashes letters, and a stage can be applied to many letter indexes at once with
+# bytes.translate. Like the plugboard and reflector they are shared by every machine,
+# which is what lets machines share a fused table (see _shared_table).
+_ROTOR_1_TBL = _wiring_table(_P_R1)
+_ROTOR_2_TBL = _wiring_table(_P_R2)
+_ROTOR_3_TBL = _wiring_table(_P_R3)
+_ROTOR_1_REV_TBL = _inverse_table(_ROTOR_1_TBL)
+_ROTOR_2_REV_TBL = _inverse_table(_ROTOR_2_TBL)
+_ROTOR_3_REV_TBL = _inverse_table(_ROTOR_3_TBL)
+
+
 class Enigma:
     """
     A simulation of the Enigma machine used for encryption and decryption.
@@ -5,22 +118,6 @@ class Enigma:
     to perform complex substitution ciphers.
     """
 
-    # Dictionary mapping letters to their corresponding index (A=0, B=1, ..., Z=25)
-    __indexes_alf = {
-        'A': 0, 'B': 1, 'C': 2, 'D': 3, 'E': 4, 'F': 5, 'G': 6, 'H': 7,
-        'I': 8, 'J': 9, 'K': 10, 'L': 11, 'M': 12, 'N': 13, 'O': 14,
-        'P': 15, 'Q': 16, 'R': 17, 'S': 18, 'T': 19, 'U': 20, 'V': 21,
-        'W': 22, 'X': 23, 'Y': 24, 'Z': 25
-    }
-
-    # Dictionary mapping indexes back to their corresponding letters (0=A, 1=B, ..., 25=Z)
-    __indexes_num = {
-        0: 'A', 1: 'B', 2: 'C', 3: 'D', 4: 'E', 5: 'F', 6: 'G', 7: 'H',
-        8: 'I', 9: 'J', 10: 'K', 11: 'L', 12: 'M', 13: 'N', 14: 'O',
-        15: 'P', 16: 'Q', 17: 'R', 18: 'S', 19: 'T', 20: 'U', 21: 'V',
-        22: 'W', 23: 'X', 24: 'Y', 25: 'Z'
-    }
-
     def __init__(self, offset: str, ring_setting: str, notch: str) -> None:
         """
         Initializes the Enigma machine with rotor settings.
@@ -29,177 +126,227 @@ class Enigma:
         :param ring_setting: 3-character string representing ring settings
         :param notch: 3-character string representing notch positions
         """
-        self.__offset_r1 = self.__indexes_alf[offset[0].upper()]
-        self.__offset_r2 = self.__indexes_alf[offset[1].upper()]  # Fixed typo in __indexes_alf
-        self.__offset_r3 = self.__indexes_alf[offset[2].upper()]
-
-        self.__ring_setting_r1 = self.__indexes_alf[ring_setting[0].upper()]
-        self.__ring_setting_r2 = self.__indexes_alf[ring_setting[1].upper()]
-        self.__ring_setting_r3 = self.__indexes_alf[ring_setting[2].upper()]
-
-        self.__notch_r1 = self.__indexes_alf[notch[0].upper()]
-        self.__notch_r2 = self.__indexes_alf[notch[1].upper()]
-        self.__notch_r3 = self.__indexes_alf[notch[2].upper()]
-
-        # Plugboard connections (Steckerbrett) - fixed pair substitutions
-        self.__plugboard = {
-            'A': 'G', 'G': 'A', 'B': 'K', 'K': 'B', 'C': 'M', 'M': 'C',
-            'D': 'Z', 'Z': 'D', 'E': 'L', 'L': 'E', 'F': 'T', 'T': 'F',
-            'H': 'V', 'V': 'H', 'I': 'P', 'P': 'I', 'J': 'X', 'X': 'J',
-            'N': 'Q', 'Q': 'N'
-        }
-
-        # Rotor I wiring (ETW - Eintrittswalze)
-        self.__P_r1 = {
-            'A': 'E', 'B': 'K', 'C': 'M', 'D': 'F', 'E': 'L', 'F': 'G',
-            'G': 'D', 'H': 'Q', 'I': 'V', 'J': 'Z', 'K': 'N', 'L': 'T',
-            'M': 'O', 'N': 'W', 'O': 'Y', 'P': 'H', 'Q': 'X', 'R': 'U',
-            'S': 'S', 'T': 'P', 'U': 'A', 'V': 'I', 'W': 'B', 'X': 'R',
-            'Y': 'C', 'Z': 'J'
-        }
-
-        # Rotor II wiring
-        self.__P_r2 = {
-            'A': 'K', 'B': 'T', 'C': 'S', 'D': 'B', 'E': 'P', 'F': 'O',
-            'G': 'G', 'H': 'U', 'I': 'L', 'J': 'R', 'K': 'H', 'L': 'E',
-            'M': 'F', 'N': 'M', 'O': 'D', 'P': 'W', 'Q': 'V', 'R': 'A',
-            'S': 'N', 'T': 'Q', 'U': 'I', 'V': 'X', 'W': 'J', 'X': 'Y',
-            'Y': 'C', 'Z': 'Z'
-        }
-
-        # Rotor III wiring
-        self.__P_r3 = {
-            'A': 'S', 'B': 'B', 'C': 'W', 'D': 'P', 'E': 'U', 'F': 'D',
-            'G': 'H', 'H': 'T', 'I': 'G', 'J': 'F', 'K': 'C', 'L': 'N',
-            'M': 'E', 'N': 'Y', 'O': 'A', 'P': 'R', 'Q': 'O', 'R': 'I',
-            'S': 'L', 'T': 'X', 'U': 'K', 'V': 'J', 'W': 'Z', 'X': 'M',
-            'Y': 'Q', 'Z': 'V'
-        }
-
-    def __plugboard_swap(self, letter: str) -> str:
+        self.__offset_r1 = self.__letter_index(offset[0])
+        self.__offset_r2 = self.__letter_index(offset[1])
+        self.__offset_r3 = self.__letter_index(offset[2])
+
+        self.__ring_setting_r1 = self.__letter_index(ring_setting[0])
+        self.__ring_setting_r2 = self.__letter_index(ring_setting[1])
+        self.__ring_setting_r3 = self.__letter_index(ring_setting[2])
+
+        self.__notch_r1 = self.__letter_index(notch[0])
+        self.__notch_r2 = self.__letter_index(notch[1])
+        self.__notch_r3 = self.__letter_index(notch[2])
+
+        # Plugboard and right rotor fused into one table per right rotor position, for the
+        # way in (Plugboard → Rotor 1) and the way out (Rotor 1 → Plugboard, yielding the
+        # output byte 'A'-'Z'). The ring setting never changes, so all 26 positions are
+        # composed once here from the module-level plugboard and rotor tables.
+        self.__plug_r1 = [self.__rotor_1(self.__plugboard_swap(_INDEXES), offset) for offset in range(26)]
+        self.__r1_plug = [self.__plugboard_swap(self.__rotor_1_rev(_INDEXES, offset))
+                          .translate(_INDEX_TO_LETTER).ljust(256, b'\0') for offset in range(26)]
+
+        # Fused output table: the whole Plugboard → Rotors → Reflector → Rotors → Plugboard
+        # path is a pure function of the rotor positions and the input letter, so its
+        # resulting byte ('A'-'Z') is stored at ((offset_r3 * 26 + offset_r2) * 26 + offset_r1) * 26 + letter.
+        # The table is filled one block of 26 * 26 entries (one middle/left rotor position)
+        # at a time when the schedule first reaches that position; __filled marks the
+        # blocks that are ready. Machines with the same ring settings share both.
+        self.__table, self.__filled = _shared_table(
+            self.__ring_setting_r1, self.__ring_setting_r2, self.__ring_setting_r3
+        )
+
+    @staticmethod
+    def __letter_index(letter: str) -> int:
         """
-        Performs plugboard substitution.
-        If the letter is connected in the plugboard, returns its pair.
-        Otherwise returns the original letter.
+        Converts a setting letter into its index (A=0, B=1, ..., Z=25).
 
-        :param letter: Input character to be substituted
-        :return: Substituted character according to plugboard wiring
+        :param letter: Single letter, case-insensitive
+        :return: Index of the letter in the alphabet
+        :raises KeyError: If the character is not a letter A-Z
         """
-        return self.__plugboard.get(letter, letter)
+        code = ord(letter)
+        index = _LETTER_INDEXES[code] if code < 256 else 255
+        if index == 255:
+            raise KeyError(letter)
+        return index
 
-    def __move_rotor(self) -> None:
+    def __plugboard_swap(self, indexes: bytes) -> bytes:
         """
-        Advances the rotors according to the Enigma stepping mechanism.
-        Implements the double-step anomaly where the middle rotor can advance
-        twice in consecutive steps under certain conditions.
+        Performs plugboard substitution.
+        If a letter is connected in the plugboard, it is replaced by its pair.
+        Otherwise the original letter is kept.
+
+        :param indexes: Indexes of the input letters (A=0, ..., Z=25)
+        :return: Indexes of the substituted letters according to plugboard wiring
         """
-        # Right rotor always advances
-        self.__offset_r1 = (self.__offset_r1 + 1) % 26
+        return indexes.translate(_PLUGBOARD_TBL)
 
-        # Middle rotor advances if right rotor is at notch position
-        if self.__offset_r1 == self.__notch_r1:
-            self.__offset_r2 = (self.__offset_r2 + 1) % 26
+    def __schedule(self, count: int) -> list:
+        """
+        Advances the rotors over the given number of letters and records where
+        each letter's row of the fused table starts, so the encryption loop
+        itself never has to step the rotors. Table blocks reached for the first
+        time are filled on the way.
 
-            # Left rotor advances if middle rotor is at notch position
-            if self.__offset_r2 == self.__notch_r2:
-                self.__offset_r3 = (self.__offset_r3 + 1) % 26
+        :param count: Number of letters to be processed
+        :return: List of ((offset_r3 * 26 + offset_r2) * 26 + offset_r1) * 26 - 65 for each letter
+        """
+        offset_r1, offset_r2, offset_r3 = self.__offset_r1, self.__offset_r2, self.__offset_r3
+        notch_r1, notch_r2 = self.__notch_r1, self.__notch_r2
+        # Position of the right rotor one step before its notch (double-step anomaly)
+        before_notch_r1 = notch_r1 - 1 if notch_r1 else 25
+
+        filled = self.__filled
+        positions = []
+        while count:
+            # Between the steps that move the middle rotor only the right rotor advances,
+            # so the rows of that batch are evenly spaced and added as one range.
+            batch = min((before_notch_r1 - offset_r1 - 1) % 26, (notch_r1 - offset_r1 - 1) % 26, count)
+            if batch:
+                block = offset_r3 * 26 + offset_r2
+                if not filled[block]:
+                    self.__fill_block(block)
+                base = block * 676 - 65
+                end = offset_r1 + batch
+                if end < 26:
+                    positions.extend(range(base + (offset_r1 + 1) * 26, base + (end + 1) * 26, 26))
+                else:
+                    end -= 26
+                    positions.extend(range(base + (offset_r1 + 1) * 26, base + 676, 26))
+                    positions.extend(range(base, base + (end + 1) * 26, 26))
+                offset_r1 = end
+                count -= batch
+                if not count:
+                    break
+
+            # Advance rotors for the next letter. The right rotor always advances,
+            # the middle one when the right rotor reaches its notch, and the left one when the
+            # middle rotor reaches its notch in turn.
+            # Positions wrap with a compare instead of % 26, which is cheaper for small ints.
+            offset_r1 = offset_r1 + 1 if offset_r1 < 25 else 0
+            if offset_r1 == notch_r1:
+                offset_r2 = offset_r2 + 1 if offset_r2 < 25 else 0
+                if offset_r2 == notch_r2:
+                    offset_r3 = offset_r3 + 1 if offset_r3 < 25 else 0
+
+            # Double-step anomaly: Middle rotor also advances when right rotor
+            # is one position before its notch
+            elif offset_r1 == before_notch_r1:
+                offset_r2 = offset_r2 + 1 if offset_r2 < 25 else 0
+
+            block = offset_r3 * 26 + offset_r2
+            if not filled[block]:
+                self.__fill_block(block)
+            positions.append((block * 26 + offset_r1) * 26 - 65)
+            count -= 1
+
+        self.__offset_r1, self.__offset_r2, self.__offset_r3 = offset_r1, offset_r2, offset_r3
+        return positions
+
+    def __rotor_1(self, indexes: bytes, offset: int) -> bytes:
+        """
+        Passes letters through the first rotor (rightmost) in forward direction.
 
-        # Double-step anomaly: Middle rotor also advances when right rotor
-        # is one position before its notch
-        elif (self.__offset_r1 + 1) % 26 == self.__notch_r1:
-            self.__offset_r2 = (self.__offset_r2 + 1) % 26
+        :param indexes: Indexes of the input letters
+        :param offset: Current rotor position
+        :return: Indexes of the transformed letters after passing through the rotor
+        """
+        shift = (offset - self.__ring_setting_r1) % 26
+        return indexes.translate(_ROTATIONS[shift]).translate(_ROTOR_1_TBL).translate(_ROTATIONS[-shift])
 
-    def __rotor_1(self, letter: str) -> str:
+    def __rotor_2(self, indexes: bytes, offset: int) -> bytes:
         """
-        Passes a letter through the first rotor (rightmost) in forward direction.
+        Passes letters through the second rotor (middle) in forward direction.
 
-        :param letter: Input character to be processed
-        :return: Transformed character after passing through the rotor
+        :param indexes: Indexes of the input letters
+        :param offset: Current rotor position
+        :return: Indexes of the transformed letters after passing through the rotor
         """
-        input_r1 = (self.__indexes_alf[letter] + self.__offset_r1 - self.__ring_setting_r1) % 26
-        wired_letter = self.__P_r1[self.__indexes_num[input_r1]]
-        output = (self.__indexes_alf[wired_letter] - self.__offset_r1 + self.__ring_setting_r1) % 26
-        return self.__indexes_num[output]
+        shift = (offset - self.__ring_setting_r2) % 26
+        return indexes.translate(_ROTATIONS[shift]).translate(_ROTOR_2_TBL).translate(_ROTATIONS[-shift])
 
-    def __rotor_2(self, letter: str) -> str:
+    def __rotor_3(self, indexes: bytes, offset: int) -> bytes:
         """
-        Passes a letter through the second rotor (middle) in forward direction.
+        Passes letters through the third rotor (leftmost) in forward direction.
 
-        :param letter: Input character to be processed
-        :return: Transformed character after passing through the rotor
+        :param indexes: Indexes of the input letters
+        :param offset: Current rotor position
+        :return: Indexes of the transformed letters after passing through the rotor
         """
-        input_r2 = (self.__indexes_alf[letter] + self.__offset_r2 - self.__ring_setting_r2) % 26
-        wired_letter = self.__P_r2[self.__indexes_num[input_r2]]
-        output = (self.__indexes_alf[wired_letter] - self.__offset_r2 + self.__ring_setting_r2) % 26
-        return self.__indexes_num[output]
+        shift = (offset - self.__ring_setting_r3) % 26
+        return indexes.translate(_ROTATIONS[shift]).translate(_ROTOR_3_TBL).translate(_ROTATIONS[-shift])
 
-    def __rotor_3(self, letter: str) -> str:
+    def __rotor_1_rev(self, indexes: bytes, offset: int) -> bytes:
         """
-        Passes a letter through the third rotor (leftmost) in forward direction.
+        Passes letters through the first rotor (rightmost) in reverse direction.
 
-        :param letter: Input character to be processed
-        :return: Transformed character after passing through the rotor
+        :param indexes: Indexes of the input letters
+        :param offset: Current rotor position
+        :return: Indexes of the transformed letters after passing through the rotor
         """
-        input_r3 = (self.__indexes_alf[letter] + self.__offset_r3 - self.__ring_setting_r3) % 26
-        wired_letter = self.__P_r3[self.__indexes_num[input_r3]]
-        output = (self.__indexes_alf[wired_letter] - self.__offset_r3 + self.__ring_setting_r3) % 26
-        return self.__indexes_num[output]
+        shift = (offset - self.__ring_setting_r1) % 26
+        return indexes.translate(_ROTATIONS[shift]).translate(_ROTOR_1_REV_TBL).translate(_ROTATIONS[-shift])
 
-    def __rotor_1_rev(self, letter: str) -> str:
+    def __rotor_2_rev(self, indexes: bytes, offset: int) -> bytes:
         """
-        Passes a letter through the first rotor (rightmost) in reverse direction.
+        Passes letters through the second rotor (middle) in reverse direction.
 
-        :param letter: Input character to be processed
-        :return: Transformed character after passing through the rotor
+        :param indexes: Indexes of the input letters
+        :param offset: Current rotor position
+        :return: Indexes of the transformed letters after passing through the rotor
         """
-        P_r1_rev = {value: key for key, value in self.__P_r1.items()}
-        input_r1 = (self.__indexes_alf[letter] + self.__offset_r1 - self.__ring_setting_r1) % 26
-        wired_letter = P_r1_rev[self.__indexes_num[input_r1]]
-        output = (self.__indexes_alf[wired_letter] - self.__offset_r1 + self.__ring_setting_r1) % 26
-        return self.__indexes_num[output]
+        shift = (offset - self.__ring_setting_r2) % 26
+        return indexes.translate(_ROTATIONS[shift]).translate(_ROTOR_2_REV_TBL).translate(_ROTATIONS[-shift])
 
-    def __rotor_2_rev(self, letter: str) -> str:
+    def __rotor_3_rev(self, indexes: bytes, offset: int) -> bytes:
         """
-        Passes a letter through the second rotor (middle) in reverse direction.
+        Passes letters through the third rotor (leftmost) in reverse direction.
 
-        :param letter: Input character to be processed
-        :return: Transformed character after passing through the rotor
+        :param indexes: Indexes of the input letters
+        :param offset: Current rotor position
+        :return: Indexes of the transformed letters after passing through the rotor
         """
-        P_r2_rev = {value: key for key, value in self.__P_r2.items()}
-        input_r2 = (self.__indexes_alf[letter] + self.__offset_r2 - self.__ring_setting_r2) % 26
-        wired_letter = P_r2_rev[self.__indexes_num[input_r2]]
-        output = (self.__indexes_alf[wired_letter] - self.__offset_r2 + self.__ring_setting_r2) % 26
-        return self.__indexes_num[output]
+        shift = (offset - self.__ring_setting_r3) % 26
+        return indexes.translate(_ROTATIONS[shift]).translate(_ROTOR_3_REV_TBL).translate(_ROTATIONS[-shift])
 
-    def __rotor_3_rev(self, letter: str) -> str:
+    def __reflector(self, indexes: bytes) -> bytes:
         """
-        Passes a letter through the third rotor (leftmost) in reverse direction.
+        Passes letters through the reflector (UKW), causing them to be redirected
+        back through the rotors via a different path.
 
-        :param letter: Input character to be processed
-        :return: Transformed character after passing through the rotor
+        :param indexes: Indexes of the input letters
+        :return: Indexes of the reflected letters according to reflector wiring
         """
-        P_r3_rev = {value: key for key, value in self.__P_r3.items()}
-        input_r3 = (self.__indexes_alf[letter] + self.__offset_r3 - self.__ring_setting_r3) % 26
-        wired_letter = P_r3_rev[self.__indexes_num[input_r3]]
-        output = (self.__indexes_alf[wired_letter] - self.__offset_r3 + self.__ring_setting_r3) % 26
-        return self.__indexes_num[output]
+        return indexes.translate(_REFLECTOR_TBL)
 
-    def __reflector(self, letter: str) -> str:
+    def __fill_block(self, block: int) -> None:
         """
-        Passes a letter through the reflector (UKW), causing it to be redirected
-        back through the rotors via a different path.
+        Fills the fused table for one position of the middle and left rotors.
+        At a fixed position the Rotors 2-3 → Reflector → Rotors 3-2 part of the path
+        is a single permutation, so it is composed once and then combined with the
+        fused plugboard/right rotor tables for each position of the right rotor.
 
-        :param letter: Input character to be processed
-        :return: Reflected character according to reflector wiring
+        :param block: Block number, offset_r3 * 26 + offset_r2
         """
-        P_ref = {
-            'A': 'R', 'R': 'A', 'B': 'Q', 'Q': 'B', 'C': 'P', 'P': 'C',
-            'D': 'O', 'O': 'D', 'E': 'N', 'N': 'E', 'F': 'M', 'M': 'F',
-            'G': 'L', 'L': 'G', 'H': 'K', 'K': 'H', 'I': 'J', 'J': 'I',
-            'S': 'Z', 'Z': 'S', 'T': 'Y', 'Y': 'T', 'U': 'X', 'X': 'U',
-            'V': 'W', 'W': 'V'
-        }
-        return P_ref[letter]
+        offset_r3, offset_r2 = divmod(block, 26)
+        middle = self.__rotor_2_rev(
+            self.__rotor_3_rev(
+                self.__reflector(
+                    self.__rotor_3(
+                        self.__rotor_2(_INDEXES, offset_r2), offset_r3
+                    )
+                ), offset_r3
+            ), offset_r2
+        ).ljust(256, b'\0')
+
+        # (Plugboard → Rotor 1) → middle → (Rotor 1 → Plugboard) for every right rotor position
+        start = block * 676
+        self.__table[start:start + 676] = b''.join(
+            plug_r1.translate(middle).translate(r1_plug)
+            for plug_r1, r1_plug in zip(self.__plug_r1, self.__r1_plug)
+        )
+        self.__filled[block] = 1
 
     def enigma(self, message: str) -> str:
         """
@@ -210,40 +357,75 @@ class Enigma:
         :return: Processed string after passing through the Enigma machine
         """
         # Normalize the message (uppercase, remove spaces)
-        message = message.upper().split()
-        message = ''.join(message)
-
-        encrypted = []
-        for char in message:
-            # Skip non-alphabetic characters (e.g., numbers, punctuation) - they are not processed by Enigma
-            # and are added to the output unchanged. This maintains the original non-alphabetic characters
-            # in their positions while only encrypting letters.
-            if not char.isalpha():
-                encrypted.append(char)
-                continue
-
-            # Advance rotors before processing each character
-            self.__move_rotor()
-
-            # Full encryption path:
-            # Plugboard → Rotors 1-3 → Reflector → Rotors 3-1 → Plugboard
-            encrypted_char = self.__plugboard_swap(
-                self.__rotor_1_rev(
-                    self.__rotor_2_rev(
-                        self.__rotor_3_rev(
-                            self.__reflector(
-                                self.__rotor_3(
-                                    self.__rotor_2(
-                                        self.__rotor_1(
-                                            self.__plugboard_swap(char)
-                                        )
-                                    )
-                                )
-                            )
-                        )
-                    )
-                )
-            )
-            encrypted.append(encrypted_char)
+        message = message.translate(_NORMALIZE)
+        if not message.isascii():
+            message = message.upper()
+        message = message.encode('utf-8', 'surrogatepass')
 
-        return ''.join(encrypted)
\ No newline at end of file
+        # Step the rotors once for every letter up front, then run the letters through the machine
+        positions = self.__schedule(len(message) - len(message.translate(None, _LETTERS)))
+        return _run(message, self.__table, positions).decode('utf-8', 'surrogatepass')
+
+    def enigma_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Encrypts or decrypts a message given in pieces (e.g. the lines of a text file)
+        and yields the processed pieces one by one, so only one piece has to be held
+        in memory at a time. The rotors keep turning between pieces, so the output
+        is the same as passing the whole message to enigma().
+
+        :param chunks: Iterable of input strings
+        :return: Iterator over the processed strings
+        """
+        for chunk in chunks:
+            yield self.enigma(chunk)
+
+
+@functools.lru_cache(maxsize=2)
+def _shared_table(ring_setting_r1: int, ring_setting_r2: int, ring_setting_r3: int) -> tuple:
+    """
+    Returns the fused output table and its block flags for the given ring settings.
+    The wirings are module-level constants, so the table depends on nothing else:
+    blocks filled by one machine are reused by every other machine with the same
+    ring settings, e.g. when many start positions are tried against the same
+    ciphertext.
+
+    Cached tables are not freed when the machines using them are destroyed; the
+    two most recently used ring settings (about 0.9 MB) stay alive for the life
+    of the process.
+
+    :param ring_setting_r1: Ring setting of the first rotor (rightmost)
+    :param ring_setting_r2: Ring setting of the second rotor (middle)
+    :param ring_setting_r3: Ring setting of the third rotor (leftmost)
+    :return: Tuple of the table (26 ** 4 bytes) and the filled flags (one per block)
+    """
+    return bytearray(26 ** 4), bytearray(26 ** 2)
+
+
+def _run(message: bytes, table: bytearray, positions: list) -> bytes:
+    """
+    Runs a normalized message through an Enigma machine.
+    The letters are processed in bulk: the fused table is indexed through map(),
+    so the per-letter work runs inside CPython's builtins instead of as
+    interpreted bytecode.
+
+    :param message: Normalized input, UTF-8 encoded
+    :param table: Fused output table of the machine
+    :param positions: Table position of each letter of the message, minus 65 so that
+                      adding the letter's byte value gives the entry to look up
+    :return: Processed message, UTF-8 encoded
+    """
+    letters = message.translate(None, _NON_LETTERS)
+    encrypted = bytes(map(table.__getitem__, map(add, positions, letters)))
+    if len(letters) == len(message):
+        return encrypted
+
+    # Put the letters back between the bytes Enigma does not process (e.g., numbers,
+    # punctuation, and every byte of a multi-byte UTF-8 sequence), which stay unchanged.
+    # Splitting on a capturing group leaves the letter runs at the even indexes.
+    parts = _PASSTHROUGH.split(message)
+    start = 0
+    for i in range(0, len(parts), 2):
+        end = start + len(parts[i])
+        parts[i] = encrypted[start:end]
+        start = end
+    return b''.join(parts)
\ No newline at end of file
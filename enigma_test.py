@@ -50,6 +50,63 @@ class TestEnigma(unittest.TestCase):
 
             raise
 
+    def test_known_ciphertext(self):
+        # Reference outputs of the original letter-by-letter implementation
+        self.assertEqual(Enigma('NFC', 'GYZ', 'DFR').enigma('TEST MESSAGE - 123,!342'),
+                         'YIVRYVPVKZJ-123,!342')
+
+        enigma = Enigma('ABC', 'WHZ', 'QFR')
+        self.assertEqual(enigma.enigma('attack at dawn'), 'UDCOXINDZJRR')
+        self.assertEqual(enigma.enigma('ATTACKATDAWN'), 'XLHLXASIZBCO')
+
+    def test_known_ciphertext_long(self):
+        # 700 letters cross many right rotor wraps, double steps and left rotor steps.
+        # Reference outputs of the original letter-by-letter implementation; the
+        # second machine has its right rotor notch at A.
+        message = 'THEQUICKBROWNFOXJUMPSOVERTHELAZYDOG' * 20
+
+        self.assertEqual(Enigma('ABC', 'WHZ', 'QFR').enigma(message), (
+            'JESGRKHYXZADZADSUCUWUIKPNQGBFYHNWAJWYAVJSNOIISFIWCURDIHYFENWJBPWWTWQKZ'
+            'EZMPGDWWYENHHHXZAMXDPQQTNEPNOJMNEBYJECYROGTVBFVVLXKDOOVIWCDLLBOATWNOCX'
+            'SLZTIUFQMMIQXMLOOAKZULJHHQKIXRVKQAPSVHEJGYAVDDLKWVRYVQGUXSCOPNOTGUNCKE'
+            'LTNZGKUTODZOLSPYNWKOOSCMSQECXKAQOEYGKLJZTAMGLTFUWTYVNXTHCKKMELCXOEPINE'
+            'OPPFPLXOWURDLKWYIPXKWCHWPOWCBTHJTSOOETDGJUFXEPABSJZGYUGMBBZEZFIYOSLQGJ'
+            'RATZHWMSEJJTGVVWWJXOQTEXLYFJYXFGKMMVBCAFPQAZERPOYPHIBTFBQDLZWTPIIAUHMJ'
+            'UDIGIVTRYQACMBEOEEQJIKNIZFVHOZVKZJZMVPMIKWPCLKBWGRYUNEOCDHPCSIOSHXQQWT'
+            'AYBIDMIMKIHQRSTOGQRRFXCYWFWRQUYHTHNWNHZQYGGEYLGAHXPQTFTVAPJDWCHHLMPCHS'
+            'XJOOCZYIVWMFPBRJQFISKAHTSQUMYYMPKBHETHKTKVGMQSLDCJMUFWBORZFURZSKXEBXDQ'
+            'GBBTTTBLMAFGSPTKYGCMFVGTAZCXXNWVPEDWVCESCZJOTHACMDNVTZWXHAIUIBQRFJVLWB'
+        ))
+        self.assertEqual(Enigma('ZXY', 'DKP', 'AEV').enigma(message), (
+            'YQAZSLNSFMMGCCIEIBIKDJMUNNRQTLBAOSIUXUMFDEUNQVYOYDDMYLZWSPZHHYFTMKCGKO'
+            'QXAWXUQOEJCQPHUFTZBLUAGLSQAUCLKNBNYBLCUKEOYYATYYOJSIIIXJKFTEGBDPVNTHBB'
+            'MKWOMSYMEYQUGAXQVKCEDAPODPJXQOHGASXNNXAIGVVNVGICCHLRSTCGPGDZJMZSGJRZVQ'
+            'HTTHALWOSXBOKKRWZWHFKEBKSIGJOXMAWJCCPQIRMLDTYDEBQHOOGETYQRNYBRJRUWCWUN'
+            'YJUGRANPAWWJVVSOKTDERZERWOBJZEQIQGTSFVRVJKDXYJQSBSTTGCHZXOPIKYOTTHOKKL'
+            'FOUFEHOZJCRTTRHPUKOATVHMDPGPUHJGJCXLEZPXRAMFJKCPHZCIMJCQIKXGFWWVGJGQNV'
+            'HGBRZDFSDSNDTYWOZVQIGEZRPHAISDFTRWWBSJRBCOZXECPTXIHBTPFOTUGSJUOWLYPNQW'
+            'VBPOXWYXVAUEYDADQDAUVFKTWAJLVJINBYLOCWDIOPCPSBKKXBDXSBMOGEFQKKHFXERRSD'
+            'EKUVWPBIADPSHRNPZOGDDMKMCPIDTZPUIITSFTRLQRYWFBPFWBQMKNUWSIGEEMBVQSMKVM'
+            'XGMKKBDVOZRASLXOGQOOELCXLNBJUDUGPUFNJPDFVTIIWCKJICIFFCICAORVLGDFJXZHUM'
+        ))
+
+    def test_non_ascii_letters_pass_through(self):
+        # Only A-Z is encrypted; other letters are kept and do not step the rotors
+        self.assertEqual(Enigma('ABC', 'WHZ', 'QFR').enigma('HÉLLO'), 'VÉAHA')
+        self.assertEqual(Enigma('ABC', 'WHZ', 'QFR').enigma('HLLO'), 'VAHA')
+
+    def test_lone_surrogate_passes_through(self):
+        # Strings decoded with 'surrogateescape' may contain lone surrogates
+        self.assertEqual(Enigma('ABC', 'WHZ', 'QFR').enigma('ab\udcffc'), 'UU\udcffT')
+
+    def test_enigma_stream(self):
+        message = 'THE QUICK BROWN FOX, 1234 - JUMPS OVER THE LAZY DOG!' * 50
+        expected = Enigma('ABC', 'WHZ', 'QFR').enigma(message)
+
+        chunks = [message[i:i + 7] for i in range(0, len(message), 7)]
+        streamed = Enigma('ABC', 'WHZ', 'QFR').enigma_stream(iter(chunks))
+        self.assertEqual(''.join(streamed), expected)
+
 
 if __name__ == '__main__':
     unittest.main()